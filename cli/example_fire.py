@@ -1,6 +1,14 @@
 import fire
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import rcParams, rcParamsDefault
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+try:
+    import pyspng
+except ImportError:
+    pyspng = None
 
 
 default_style = {
@@ -10,10 +18,45 @@ default_style = {
 }
 
 
+# savefig options that aren't applied when PNG is encoded with pyspng
+SAVEFIG_PARAMS = (
+    'savefig.dpi',
+    'savefig.facecolor',
+    'savefig.edgecolor',
+    'savefig.transparent',
+    'savefig.bbox'
+)
+
+
+def save_png(figure: Figure, path: str, compress_level: int):
+    """Saves figure as PNG.
+
+    The rendered canvas is encoded with `pyspng` if it is installed and the
+    `savefig.*` rcParams listed in `SAVEFIG_PARAMS` have default values;
+    such file doesn't include pHYs (DPI) and Software metadata. Otherwise,
+    falls back to matplotlib's PIL writer.
+    """
+    defaults = all(rcParams[key] == rcParamsDefault[key]
+                   for key in SAVEFIG_PARAMS)
+    if pyspng is None or not defaults:
+        figure.savefig(
+            path, format='png',
+            pil_kwargs={'compress_level': compress_level})
+        return
+    figure.canvas.draw()
+    image = np.asarray(figure.canvas.buffer_rgba())
+    with open(path, 'wb') as file:
+        file.write(pyspng.encode(image, compress_level=compress_level))
+
+
 class Plotter:
-    def __init__(self, style: dict=None):
+    def __init__(self, style: dict=None, compress_level: int=1):
         self.style = style or default_style
-        plt.rcParams.update(self.style)
+        self.compress_level = compress_level
+        rcParams.update(self.style)
+        self._figure = Figure()
+        FigureCanvasAgg(self._figure)
+        self._axes = self._figure.add_subplot(1, 1, 1)
 
     def scatter(self, name: str, *points):
         n = len(points)
@@ -21,12 +64,12 @@ class Plotter:
             n -= 1
         points = points[:n]
         xs, ys = points[::2], points[1::2]
-        f, ax = plt.subplots(1, 1)
-        ax.scatter(xs, ys)
-        self.save(f, name)
+        self._axes.clear()
+        self._axes.plot(xs, ys, 'o')
+        self.save(self._figure, name)
 
-    def save(self, figure: plt.Figure, output: str):
-        figure.savefig(f'{output}.png', format='png')
+    def save(self, figure: Figure, output: str):
+        save_png(figure, f'{output}.png', self.compress_level)
 
 
 if __name__ == '__main__':
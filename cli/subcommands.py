@@ -1,8 +1,28 @@
 from argparse import ArgumentParser, ArgumentError, ArgumentTypeError
-from functools import partial
+from functools import lru_cache, partial
 import json
-from os.path import exists
-import matplotlib.pyplot as plt
+from os.path import exists, getmtime
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import rcParams, rcParamsDefault
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_hex, to_rgba
+from matplotlib.figure import Figure
+try:
+    import pyspng
+except ImportError:
+    pyspng = None
+
+
+# savefig options that aren't applied when PNG is encoded with pyspng
+SAVEFIG_PARAMS = (
+    'savefig.dpi',
+    'savefig.facecolor',
+    'savefig.edgecolor',
+    'savefig.transparent',
+    'savefig.bbox'
+)
 
 
 def main():
@@ -12,15 +32,106 @@ def main():
         'stdin': vars(args),
         'json': getattr(args, 'config', None)
     }[args.command]
-    f, ax = plt.subplots(1, 1, figsize=params['canvas_size'])
+    fmt = params['image_format']
+    path = f'{params["out"]}.{fmt}'
+    if fmt == 'svg' and params['hide_axes'] and not params['show_grid']:
+        polyline = as_polyline(params['points'])
+        if polyline is not None:
+            write_svg_polyline(*polyline, path, params['canvas_size'])
+            return
+    f = Figure(figsize=params['canvas_size'], constrained_layout=True)
+    FigureCanvasAgg(f)
+    ax = f.add_subplot(1, 1, 1)
     if params['hide_axes']:
         ax.set_axis_off()
     if params['show_grid']:
         ax.grid(True)
     ax.plot(*params['points'])
-    fmt = params['image_format']
-    f.tight_layout()
-    f.savefig(f'{params["out"]}.{fmt}', format=fmt)
+    if fmt == 'png':
+        save_png(f, path, args.compress_level)
+    else:
+        f.savefig(path, format=fmt)
+
+
+def save_png(figure: Figure, path: str, compress_level: int):
+    """Saves figure as PNG.
+
+    The rendered canvas is encoded with `pyspng` if it is installed and the
+    `savefig.*` rcParams listed in `SAVEFIG_PARAMS` have default values;
+    such file doesn't include pHYs (DPI) and Software metadata. Otherwise,
+    falls back to matplotlib's PIL writer.
+    """
+    defaults = all(rcParams[key] == rcParamsDefault[key]
+                   for key in SAVEFIG_PARAMS)
+    if pyspng is None or not defaults:
+        figure.savefig(
+            path, format='png',
+            pil_kwargs={'compress_level': compress_level})
+        return
+    figure.canvas.draw()
+    image = np.asarray(figure.canvas.buffer_rgba())
+    with open(path, 'wb') as file:
+        file.write(pyspng.encode(image, compress_level=compress_level))
+
+
+def as_polyline(points):
+    """Converts `points` into (xs, ys) arrays if it is a pair of equally
+    sized sequences of finite numbers, and returns None otherwise.
+    """
+    if len(points) != 2:
+        return None
+    try:
+        xs, ys = (np.asarray(values, dtype=np.float64) for values in points)
+    except (TypeError, ValueError):
+        return None
+    if not (xs.ndim == ys.ndim == 1 and xs.size == ys.size > 0):
+        return None
+    if not (np.isfinite(xs).all() and np.isfinite(ys).all()):
+        return None
+    return xs, ys
+
+
+def write_svg_polyline(xs: np.ndarray, ys: np.ndarray, path: str,
+                       canvas_size: tuple, margin: float=0.05):
+    """Writes points as a single SVG polyline without involving matplotlib.
+
+    Only suitable for plots without axes and grid: the points are linearly
+    mapped onto the canvas, leaving `margin` fraction of free space on each
+    side, similarly to matplotlib's default data margins. Background and
+    line styles are taken from `rcParams`.
+    """
+    width, height = (72 * size for size in canvas_size)
+
+    def rescale(values, size):
+        lo, hi = values.min(), values.max()
+        if lo == hi:
+            return np.full_like(values, size / 2)
+        return size * (margin + (1 - 2*margin) * (values - lo) / (hi - lo))
+
+    xs = rescale(xs, width)
+    ys = height - rescale(ys, height)
+    coords = ' '.join(f'{x:.2f},{y:.2f}' for x, y in zip(xs, ys))
+
+    background = to_rgba(rcParams['figure.facecolor'])
+    stroke = to_hex(rcParams['axes.prop_cycle'].by_key()['color'][0])
+    linewidth = rcParams['lines.linewidth']
+    # newer matplotlib versions keep cap and join styles as enums
+    capstyle, joinstyle = (
+        getattr(style, 'value', style) for style in
+        (rcParams['lines.solid_capstyle'], rcParams['lines.solid_joinstyle']))
+    capstyle = {'projecting': 'square'}.get(capstyle, capstyle)
+
+    with open(path, 'w') as file:
+        file.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" '
+            f'width="{width}pt" height="{height}pt" '
+            f'viewBox="0 0 {width} {height}">\n'
+            f'<rect width="100%" height="100%" fill="{to_hex(background)}" '
+            f'fill-opacity="{background[3]}"/>\n'
+            f'<polyline points="{coords}" fill="none" '
+            f'stroke="{stroke}" stroke-width="{linewidth}" '
+            f'stroke-linecap="{capstyle}" stroke-linejoin="{joinstyle}"/>\n'
+            f'</svg>\n')
 
 
 def create_parser():
@@ -41,6 +152,11 @@ def create_parser():
         default='output',
         help='Path to the output image file (default: %(default)s)'
     )
+    parser.add_argument(
+        '--compress-level',
+        type=int, metavar='LVL', default=1, choices=range(10),
+        help='PNG compression level from 0 to 9 (default: %(default)s)'
+    )
 
     commands = parser.add_subparsers(dest='sub-command')
     commands.required = True
@@ -98,13 +214,12 @@ def list_of_points(value: str) -> tuple:
     """Ensures that `points` argument contains a valid sequence of values."""
 
     try:
-        points = value.split(';')
-        xs, ys = [], []
-        for point in points:
-            x, y = point.split(',')
-            xs.append(float(x))
-            ys.append(float(y))
-        return xs, ys
+        points = np.array(
+            [point.split(',') for point in value.split(';')],
+            dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError(value)
+        return points[:, 0].tolist(), points[:, 1].tolist()
     except ValueError:
         raise ArgumentTypeError('should have format: 1,2;2,3;3,4')
 
@@ -128,8 +243,7 @@ def load_json_file(value: str, default: dict=None) -> str:
     if not exists(value):
         raise ArgumentError(value, 'file doesn\'t exist')
     try:
-        with open(value) as file:
-            content = json.load(file)
+        content = dict(_read_json(value, getmtime(value)))
         if default is not None:
             for key, value in default.items():
                 if key not in content:
@@ -139,5 +253,14 @@ def load_json_file(value: str, default: dict=None) -> str:
         raise ArgumentTypeError('invalid JSON file')
 
 
+@lru_cache(maxsize=32)
+def _read_json(path: str, mtime: float) -> dict:
+    """Reads JSON file; the cache is keyed by modification time to pick
+    up changes made to the file between calls.
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
 if __name__ == '__main__':
     main()
@@ -37,6 +37,7 @@ class Node(_Node):
         self.value = value
         self.gini = gini
         self.counts = counts
+        self.total = sum(counts.values())
         self.depth = depth
         self.left = left
         self.right = right
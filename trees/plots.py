@@ -1,13 +1,17 @@
 import random
-from io import StringIO
+from functools import lru_cache
 from string import digits
 
 import numpy as np
 
 
+NODE_TMPL = '{uid} [label="{label}", fillcolor="{color}"];\n'
+EDGE_TMPL = '{src} -> {dst} [label={lbl}, labeldistance=2.5, labelangle=45];\n'
+
+
 def node_id(size=20, chars=digits):
     """Generates a random node ID for Graphviz file."""
-    return ''.join([random.choice(chars) for _ in range(size)])
+    return ''.join(random.choices(chars, k=size))
 
 
 def create_graph(tree, feature_names, class_names, output_file=None,
@@ -26,37 +30,45 @@ def create_graph(tree, feature_names, class_names, output_file=None,
         colors = palette
 
 
-    def create(node, file):
-        uid = node_id()
-        label = node_to_str(node)
-        color = get_node_color(node)
+    def create(root, lines):
+        stack = [(root, None, None)]
 
-        file.write(f'{uid} [label="{label}", fillcolor="{color}"];\n')
+        while stack:
+            node, parent_uid, edge_label = stack.pop()
+            uid = node_id()
+            total = top_cls = top_count = None
+            if not node.is_leaf:
+                total = node.total
+                [(top_cls, top_count)] = node.counts.most_common(1)
+            label = node_to_str(node, total, top_count)
+            color = get_node_color(node, total, top_cls, top_count)
 
-        if not node.is_leaf:
-            edge = '%s -> %s [label=%s, labeldistance=2.5, labelangle=45];\n'
+            lines.append(NODE_TMPL.format(uid=uid, label=label, color=color))
 
-            if node.left is not None:
-                l_uid = create(node.left, file)
-                file.write(edge % (uid, l_uid, 'yes'))
+            if parent_uid is not None:
+                lines.append(EDGE_TMPL.format(
+                    src=parent_uid, dst=uid, lbl=edge_label))
 
-            if node.right is not None:
-                r_uid = create(node.right, file)
-                file.write(edge % (uid, r_uid, 'no'))
+            if not node.is_leaf:
+                # push the right child first to visit the left subtree first
+                if node.right is not None:
+                    stack.append((node.right, uid, 'no'))
 
-        return uid
+                if node.left is not None:
+                    stack.append((node.left, uid, 'yes'))
 
 
-    def node_to_str(node):
+    def node_to_str(node, total, num_of_samples):
         """
         Converts decision tree node into string representation.
+
+        The `total` and `num_of_samples` are the number of samples in the
+        (non-leaf) node and in its most common class respectively.
         """
         if node.is_leaf:
             return class_names[node.value]
         else:
             name = feature_names[node.feature]
-            total = sum(node.counts.values())
-            [(category, num_of_samples)] = node.counts.most_common(1)
             ratio = num_of_samples / total
             lines = [
                 f'samples: {total}',
@@ -66,49 +78,41 @@ def create_graph(tree, feature_names, class_names, output_file=None,
             return '\n'.join(lines)
 
 
-    def get_node_color(node):
+    def get_node_color(node, total, cls, count):
         if node.is_leaf:
             color = colors[node.value]
         else:
-            [(cls, count)] = node.counts.most_common(1)
-            total = sum(node.counts.values())
             rgb = colors[cls]
             alpha = int(255 * count / total)
-            color = rgb + [alpha]
+            color = list(rgb) + [alpha]
 
         return to_hexadecimal(color)
 
 
-    opened_file = False
-    try:
-        if output_file is None:
-            fp = StringIO()
-        else:
-            fp = open(output_file, 'w', encoding='utf-8')
-            opened_file = True
-        styles = [f'{k}="{v}"' for k, v in styling.items()]
-        fp.write('digraph Tree {\n')
-        fp.write('bgcolor="#00000000";\n')
-        fp.write('node [%s];\n' % ', '.join(styles))
-        if title is not None:
-            fp.write('labelloc="t";\n')
-            fp.write(f'label="{title}";\n')
-        create(tree, fp)
-        fp.write('}')
-        return fp.getvalue()
-
-    finally:
-        if opened_file:
-            fp.close()
+    styles = [f'{k}="{v}"' for k, v in styling.items()]
+    lines = [
+        'digraph Tree {\n',
+        'bgcolor="#00000000";\n',
+        'node [%s];\n' % ', '.join(styles)]
+    if title is not None:
+        lines.append('labelloc="t";\n')
+        lines.append(f'label="{title}";\n')
+    create(tree, lines)
+    lines.append('}')
+    text = ''.join(lines)
+
+    if output_file is not None:
+        with open(output_file, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+
+    return text
 
 
 def to_hexadecimal(values):
-    hex_codes = [str(i) for i in range(10)]
-    hex_codes.extend(['a', 'b', 'c', 'd', 'e', 'f'])
-    color = [hex_codes[c // 16] + hex_codes[c % 16] for c in values]
-    return '#' + ''.join(color)
+    return '#' + bytes(int(c) for c in values).hex()
 
 
+@lru_cache(maxsize=64)
 def _color_brew(n):
     """Generate n colors with equally spaced hues.
 
@@ -119,33 +123,25 @@ def _color_brew(n):
 
     Returns
     -------
-    color_list : list, length n
-        List of n tuples of form (R, G, B) being the components of each color.
+    color_list : tuple, length n
+        Tuple of n tuples of form (R, G, B) being the components of each color.
     """
-    color_list = []
-
     # Initialize saturation & value; calculate chroma & value shift
     s, v = 0.75, 0.9
     c = s * v
     m = v - c
 
-    for h in np.arange(25, 385, 360. / n).astype(int):
-        # Calculate some intermediate values
-        h_bar = h / 60.
-        x = c * (1 - abs((h_bar % 2) - 1))
-        # Initialize RGB with same hue & chroma as our color
-        rgb = [(c, x, 0),
-               (x, c, 0),
-               (0, c, x),
-               (0, x, c),
-               (x, 0, c),
-               (c, 0, x),
-               (c, x, 0)]
-        r, g, b = rgb[int(h_bar)]
-        # Shift the initial RGB values to match value and store
-        rgb = [(int(255 * (r + m))),
-               (int(255 * (g + m))),
-               (int(255 * (b + m)))]
-        color_list.append(rgb)
-
-    return color_list
+    # Calculate some intermediate values for all hues at once
+    h = np.arange(25, 385, 360. / n).astype(int)
+    h_bar = h / 60.
+    x = c * (1 - np.abs((h_bar % 2) - 1))
+    # Pick RGB with same hue & chroma as our color; the 7th sector (h >= 360)
+    # wraps around to the first one
+    sector = h_bar.astype(int) % 6
+    r = np.choose(sector, [c, x, 0, 0, x, c])
+    g = np.choose(sector, [x, c, c, x, 0, 0])
+    b = np.choose(sector, [0, 0, x, c, c, x])
+    # Shift the initial RGB values to match value
+    rgb = (255 * (np.stack([r, g, b], axis=1) + m)).astype(int)
+
+    return tuple(map(tuple, rgb.tolist()))
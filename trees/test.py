@@ -1,12 +1,14 @@
+import re
+from collections import Counter
 from os.path import join, dirname
 
 import pytest
 import graphviz
 import numpy as np
 
-from plots import create_graph
+from plots import create_graph, _color_brew
 from ensemble import RandomForestClassifier
-from decision_tree import learn_tree, predict_tree
+from decision_tree import Node, Leaf, learn_tree, predict_tree
 from utils import read_csv, encode_labels, train_test_split
 
 
@@ -63,6 +65,63 @@ def test_creating_an_ensemble_of_trees(wine_dataset):
     print(f'Test set accuracy: {acc:2.2%}')
 
 
+@pytest.mark.parametrize('n,expected', [
+    (1, [(229, 129, 57)]),
+    (2, [(229, 129, 57), (57, 157, 229)]),
+    (3, [(229, 129, 57), (57, 229, 129), (129, 57, 229)]),
+    (5, [(229, 129, 57), (123, 229, 57), (57, 229, 197), (60, 57, 229),
+         (229, 57, 192)]),
+    (8, [(229, 129, 57), (200, 229, 57), (71, 229, 57), (57, 229, 172),
+         (57, 157, 229), (86, 57, 229), (215, 57, 229), (229, 57, 114)])
+])
+def test_color_brew_palette(n, expected):
+    assert list(_color_brew(n)) == expected
+
+
+def test_graph_structure():
+    inner = Node(feature=1, value=0.25, gini=0.5, counts=Counter({1: 2, 2: 2}),
+                 depth=1, left=Leaf(1), right=Leaf(2))
+    root = Node(feature=0, value=1.5, gini=0.625,
+                counts=Counter({0: 4, 1: 2, 2: 2}),
+                depth=0, left=Leaf(0), right=inner)
+
+    dot_data = create_graph(root, ['alcohol', 'ash'], ['a', 'b', 'c'],
+                            title='tree')
+    nodes, edges = parse_dot(dot_data)
+
+    assert dot_data.startswith(
+        'digraph Tree {\n'
+        'bgcolor="#00000000";\n'
+        'node [shape="box", style="filled, rounded", color="black"];\n'
+        'labelloc="t";\n'
+        'label="tree";\n')
+    assert dot_data.endswith('}')
+    assert nodes == [
+        ('samples: 8\ngini: 0.62\nratio: 0.50\nalcohol <= 1.50', '#e581397f'),
+        ('a', '#e58139'),
+        ('samples: 4\ngini: 0.50\nratio: 0.50\nash <= 0.25', '#39e5817f'),
+        ('b', '#39e581'),
+        ('c', '#8139e5')]
+    assert edges == {(0, 1, 'yes'), (0, 2, 'no'), (2, 3, 'yes'), (2, 4, 'no')}
+
+
+def parse_dot(dot_data):
+    """Returns nodes (label, color) in order of appearance and set of edges
+    referring to nodes by their index.
+    """
+    node_re = re.compile(r'^(\d+) \[label="(.*?)", fillcolor="(.*?)"\];$',
+                         re.M | re.S)
+    edge_re = re.compile(r'^(\d+) -> (\d+) \[label=(\w+), '
+                         r'labeldistance=2.5, labelangle=45\];$', re.M)
+    index, nodes = {}, []
+    for uid, label, color in node_re.findall(dot_data):
+        index[uid] = len(nodes)
+        nodes.append((label, color))
+    edges = {(index[src], index[dst], label)
+             for src, dst, label in edge_re.findall(dot_data)}
+    return nodes, edges
+
+
 def compute_accuracy(tree, X_test, y_test):
     preds = predict_tree(tree, X_test)
     acc = np.mean(y_test == preds)